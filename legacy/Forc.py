@@ -2,15 +2,24 @@ import numpy as np
 import pathlib
 import logging
 import abc
-# import pandas as pd
-import scipy.interpolate as si
-import scipy.ndimage.filters as snf
-import scipy.optimize as so
+import functools
 import util
-import numba as nb
+
+# scipy submodules are imported lazily inside the methods that use them: they are heavy to
+# load and none of them is needed just to import this module.
 
 log = logging.getLogger(__name__)
 
+# Translation table for turning a block of csv data lines into one comma-separated record:
+# newlines become value separators and carriage returns are dropped.
+_DATA_SEPARATORS = bytes.maketrans(b'\n', b',')
+
+# Kernel width (2*sf+1) at which the FORC distribution switches from the direct numba
+# stencil to FFT convolution; the direct path wins for the small kernels typical of
+# interactive use, the FFT path for very aggressive smoothing on large grids.
+SG_FFT_THRESHOLD = 15
+SG_GPU_THRESHOLD = 1_000_000
+
 
 class ForcBase(abc.ABC):
     """Base class for all FORC subclasses.
@@ -57,13 +66,19 @@ class PMCForc(ForcBase):
     ----------
     path : str
         Path to PMC formatted data file.
+    dtype : data-type
+        Dtype used to store the raw measurement data. PMC instruments deliver 4-5 significant
+        digits, so the float32 default is lossless in practice and halves the memory traffic of
+        interpolation; pass np.float64 to keep full double precision.
     """
 
     def __init__(self, path=None, step=None, method='cubic', drift=False, radius=4, density=3,
-                 h=None, hr=None, m=None, T=None, rho=None):
+                 h=None, hr=None, m=None, T=None, rho=None, dtype=np.float32):
 
         super(PMCForc, self).__init__(None)
 
+        self.dtype = np.dtype(dtype)
+
         self._h_min = np.nan
         self._h_max = np.nan
         self._hr_min = np.nan
@@ -111,17 +126,19 @@ class PMCForc(ForcBase):
 
     def _from_input_arrays(self, h, hr, m, T, rho):
         if all([isinstance(item, np.ndarray) for item in (h, hr, m)]):
-            self.h = h
-            self.hr = hr
-            self.m = m
+            # Coerce to the storage dtype so arithmetic with float64 scalars upstream (slope
+            # values, normalization factors) doesn't silently promote the whole dataset.
+            self.h = h.astype(self.dtype, copy=False)
+            self.hr = hr.astype(self.dtype, copy=False)
+            self.m = m.astype(self.dtype, copy=False)
 
             if isinstance(T, np.ndarray):
-                self.temperature = T
+                self.temperature = T.astype(self.dtype, copy=False)
             elif T is not None:
                 raise IOError('Invalid input type for T: {}'.format(type(T)))
 
             if isinstance(rho, np.ndarray):
-                self.rho = rho
+                self.rho = rho.astype(self.dtype, copy=False)
             elif rho is not None:
                 raise IOError('Invalid input type for rho: {}'.format(type(rho)))
 
@@ -142,14 +159,13 @@ class PMCForc(ForcBase):
         file = pathlib.Path(path)
         log.info("Extracting data from file: {}".format(file))
 
-        with open(file, 'r') as f:
-            lines = f.readlines()
+        buf = file.read_bytes()
 
-        self._extract_raw_data(lines)
+        self._extract_raw_data(buf)
 
         return
 
-    def _has_drift_points(self, lines):
+    def _has_drift_points(self, buf):
         """Checks whether the measurement space has been specified in (Hc, Hb) coordinates or in (H, Hr). If it
         has been measured in (Hc, Hb) coordinates, the header will contain references to the limits of the
         measured data. If the measurement has been done in (Hc, Hb), drift points are necessary before the
@@ -157,8 +173,8 @@ class PMCForc(ForcBase):
 
         Parameters
         ----------
-        lines : str
-            Lines from a PMC-formatted data file.
+        buf : bytes
+            Contents of a PMC-formatted data file.
 
         Returns
         -------
@@ -166,10 +182,7 @@ class PMCForc(ForcBase):
             True if 'Hb1' is detected in the start of a line somewhere in the data file, False otherwise.
         """
 
-        for i in range(len(lines)):
-            if "Hb1" == lines[i][:3]:
-                return True
-        return False
+        return buf.startswith(b'Hb1') or b'\nHb1' in buf
 
     def _lines_have_temperature(self, line):
         """Checks for temperature measurements in a file. If line has 3 data values, the third is considered
@@ -177,7 +190,7 @@ class PMCForc(ForcBase):
 
         Parameters
         ----------
-        line : str
+        line : bytes
             PMC formatted line to check
 
         Returns
@@ -186,42 +199,131 @@ class PMCForc(ForcBase):
             True if the line contains 3 floats or False if not.
         """
 
-        return len(line.split(sep=',')) == 3
+        return len(line.split(sep=b',')) == 3
+
+    def _extract_raw_data(self, buf):
+        """Extracts the raw data from the contents of a PMC-formatted csv file.
 
-    def _extract_raw_data(self, lines):
-        """Extracts the raw data from lines of a PMC-formatted csv file.
+        The buffer is scanned once with NumPy to locate line boundaries and to classify data
+        lines by their first byte. Runs of consecutive data lines are identified globally from
+        that classification, and the reversal curves and drift points are each parsed in a
+        single bulk csv pass; no line is ever decoded individually.
 
         Parameters
         ----------
-        lines : str
+        buf : bytes
             Contents of a PMC-formatted data file.
         """
 
-        i = self._find_first_data_point(lines)
-        if self._lines_have_temperature(lines[i]):
-            self._T = []
-
-        if self._has_drift_points(lines):
-            while i < len(lines) and lines[i][0] in ['+', '-']:
-                self._extract_drift_point(lines[i])
-                i += 2
-                i += self._extract_next_forc(lines[i:])
-                i += 1
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        newlines = np.flatnonzero(arr == ord('\n'))
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [arr.shape[0]]))
+        if starts[-1] == arr.shape[0]:
+            # File ends with a newline; drop the empty trailing line.
+            starts = starts[:-1]
+            ends = ends[:-1]
+
+        first_bytes = arr[starts]
+        is_data = (first_bytes == ord('+')) | (first_bytes == ord('-'))
+
+        i = self._find_first_data_point(is_data)
+        has_temperature = self._lines_have_temperature(buf[starts[i]:ends[i]])
+
+        # Line indices of each run of consecutive data lines; a run is either a whole
+        # reversal curve or a single drift-point line, depending on the file layout.
+        run_starts = np.flatnonzero(is_data & ~np.concatenate(([False], is_data[:-1])))
+        run_ends = np.flatnonzero(is_data & ~np.concatenate((is_data[1:], [False]))) + 1
+
+        n_runs = run_starts.shape[0]
+        if self._has_drift_points(buf):
+            # Runs alternate drift point, curve, drift point, curve, ... with exactly one
+            # separator line between each; stop at the first run which breaks the pattern,
+            # as the old line-by-line state machine did.
+            curve_runs = []
+            drift_lines = []
+            r = 0
+            while r + 1 < n_runs and run_starts[r + 1] == run_starts[r] + 2:
+                drift_lines.append(run_starts[r])
+                curve_runs.append(r + 1)
+                if r + 2 >= n_runs or run_starts[r + 2] != run_ends[r + 1] + 1:
+                    break
+                r += 2
+            self.drift_points = self._parse_drift_points(buf, starts, ends, drift_lines)
         else:
-            while i < len(lines) and lines[i][0]in ['+', '-']:
-                i += self._extract_next_forc(lines[i:])
-                self._extract_drift_point(lines[i-1])
-                i += 1
+            # Every run is a curve; consecutive curves are separated by exactly one line.
+            # Drift points are the last measurement of each curve, filled in after the parse.
+            curve_runs = []
+            r = 0
+            while r < n_runs:
+                curve_runs.append(r)
+                if r + 1 >= n_runs or run_starts[r + 1] != run_ends[r] + 1:
+                    break
+                r += 1
+            self.drift_points = None
+
+        curve_runs = np.asarray(curve_runs, dtype=np.intp)
+        lengths = run_ends[curve_runs] - run_starts[curve_runs]
+        curve_bounds = np.cumsum(lengths)
+
+        # Parse every curve in the file with one csv pass instead of one per curve.
+        blocks = [buf[starts[run_starts[r]]:ends[run_ends[r] - 1]] for r in curve_runs]
+        payload = b'\n'.join(blocks).translate(_DATA_SEPARATORS, b'\r').decode('ascii')
+        values = np.fromstring(payload, sep=',').reshape(int(curve_bounds[-1]), -1)
+
+        h = values[:, 0]
+        m = values[:, 1]
+        hr = np.repeat(h[np.concatenate(([0], curve_bounds[:-1]))], lengths)
+        T = values[:, 2] if has_temperature else None
+
+        if self.drift_points is None:
+            self.drift_points = m[curve_bounds - 1].copy()
+
+        self._consolidate_raw_data(h, hr, m, T, curve_bounds[:-1])
+
+        return
+
+    def _consolidate_raw_data(self, h, hr, m, T, boundaries):
+        """Pack the parsed components into a single contiguous (4, N) array of self.dtype.
+
+        Rows are h, hr, m and T. self.h, self.hr, self.m (and self.temperature, if measured)
+        become ragged lists of per-curve arrays, but each curve is a zero-copy view into the
+        packed array, so code which wants the flat structure-of-arrays form can use
+        self._raw_data without another conversion.
+
+        Parameters
+        ----------
+        h, hr, m : ndarray
+            Flat arrays of the parsed measurements, all curves concatenated.
+        T : ndarray or None
+            Flat array of the parsed temperatures, or None if not measured.
+        boundaries : ndarray
+            Indices splitting the flat arrays into per-curve segments.
+        """
+
+        data = np.empty((4, h.shape[0]), dtype=self.dtype)
+        data[0] = h
+        data[1] = hr
+        data[2] = m
+        data[3] = np.nan if T is None else T
+
+        self._raw_data = data
+        self._curve_boundaries = np.asarray(boundaries)
+        self.h = np.split(data[0], boundaries)
+        self.hr = np.split(data[1], boundaries)
+        self.m = np.split(data[2], boundaries)
+        if T is not None:
+            self.temperature = np.split(data[3], boundaries)
 
         return
 
-    def _find_first_data_point(self, lines):
+    def _find_first_data_point(self, is_data):
         """Return the index of the first data point in the PMC-formatted lines.
 
         Parameters
         ----------
-        lines : str
-            Contents of a PMC-formatted data file.
+        is_data : ndarray
+            Boolean array, one entry per line, True where the line begins with '+' or '-'.
 
         Raises
         ------
@@ -235,59 +337,36 @@ class PMCForc(ForcBase):
             the header lines do not begin with '+' or '-'.
         """
 
-        for i in range(len(lines)):
-            if lines[i][0] in ['+', '-']:
-                return i
+        if not is_data.any():
+            raise DataFormatError("No data found in file. Check data format spec.")
 
-        raise DataFormatError("No data found in file. Check data format spec.")
+        return int(is_data.argmax())
 
-    def _extract_next_forc(self, lines):
-        """Extract the next curve from the data.
+    def _parse_drift_points(self, buf, starts, ends, lines):
+        """Parse all drift-point lines in one bulk csv pass. Only records the moments,
+        not the measurement fields from the drift points (the field isn't used in any drift
+        correction).
 
         Parameters
         ----------
-        lines : str
-            Raw csv data in string format, from a PMC-type formatted file.
+        buf : bytes
+            Contents of a PMC-formatted data file.
+        starts : ndarray
+            Byte offsets of the start of each line in buf.
+        ends : ndarray
+            Byte offsets of the end of each line in buf (excluding the newline).
+        lines : list of int
+            Indices of the lines which contain drift points.
 
         Returns
         -------
-        int
-            Number of lines extracted
+        ndarray
+            Drift moment for each curve.
         """
 
-        _h, _m, _hr, _T = [], [], [], []
-        i = 0
-
-        while lines[i][0] in ['+', '-']:
-            split_line = lines[i].split(',')
-            _h.append(float(split_line[0]))
-            _hr.append(_h[0])
-            _m.append(float(split_line[1]))
-            if self.temperature is not None:
-                _T.append(float(split_line[2]))
-            i += 1
-
-        self.h.append(_h)
-        self.hr.append(_hr)
-        self.m.append(_m)
-        if self.temperature is not None:
-            self.temperature.append(_T)
-
-        return len(_h)
-
-    def _extract_drift_point(self, line):
-        """Extract the drift point from the specified input line. Only records the moment,
-        not the measurement field from the drift point (the field isn't used in any drift correction).
-        Appends the drift point to self.drift_points.
-
-        Parameters
-        ----------
-        line : str
-            Line from data file which contains the drift point.
-        """
-
-        self.drift_points.append(float(line.split(sep=',')[1]))
-        return
+        payload = b'\n'.join([buf[starts[line]:ends[line]] for line in lines])
+        payload = payload.translate(_DATA_SEPARATORS, b'\r').decode('ascii')
+        return np.fromstring(payload, sep=',').reshape(len(lines), -1)[:, 1].copy()
 
     @property
     def shape(self):
@@ -309,53 +388,91 @@ class PMCForc(ForcBase):
             Field step size.
         """
 
-        step_sizes = np.empty(len(self.h))
+        # The mean of the steps along a curve telescopes to (last - first)/(n - 1), so the
+        # per-curve means come from two gathers and one subtraction instead of a np.diff and
+        # np.mean call per curve.
+        if isinstance(self.h, np.ndarray):
+            return float(np.mean((self.h[:, -1] - self.h[:, 0]) / (self.h.shape[1] - 1)))
 
-        for i in range(step_sizes.shape[0]):
-            step_sizes[i] = np.mean(np.diff(self.h[i], n=1))
+        h = self._raw_data[0]
+        first = np.concatenate(([0], self._curve_boundaries))
+        last = np.concatenate((self._curve_boundaries, [h.shape[0]])) - 1
 
-        return np.mean(step_sizes)
+        return float(np.mean((h[last] - h[first]) / (last - first)))
 
     def _interpolate(self, method='cubic'):
+        import scipy.interpolate as si
+        import scipy.spatial as ss
 
-        # Determine min and max values of (h, hr) from raw input lists for interpolation.
-        h_min = self.h[0][0]
-        h_max = self.h[0][0]
-        hr_min = self.hr[0][0]
-        hr_max = self.hr[0][0]
-        for i in range(len(self.h)):
-            h_min = np.min(self.h[i]) if np.min(self.h[i]) < h_min else h_min
-            h_max = np.max(self.h[i]) if np.max(self.h[i]) > h_max else h_max
-            hr_min = np.min(self.hr[i]) if np.min(self.hr[i]) < hr_min else hr_min
-            hr_max = np.max(self.hr[i]) if np.max(self.hr[i]) > hr_max else hr_max
+        # Determine min and max values of (h, hr) for interpolation with one reduction each
+        # over the packed raw data rather than a python loop over the curves.
+        h_min = self._raw_data[0].min()
+        h_max = self._raw_data[0].max()
+        hr_min = self._raw_data[1].min()
+        hr_max = self._raw_data[1].max()
 
         _h, _hr = np.meshgrid(np.arange(h_min, h_max, self.step),
                               np.arange(hr_min, hr_max, self.step))
 
-        data_hhr = [[self.h[i][j], self.hr[i][j]] for i in range(len(self.h)) for j in range(len(self.h[i]))]
-        data_m = [self.m[i][j] for i in range(len(self.h)) for j in range(len(self.h[i]))]
+        # The packed raw data already holds the flat h/hr/m/T arrays; stack the coordinate
+        # columns instead of rebuilding them element by element through python lists.
+        data_hhr = np.column_stack((self._raw_data[0], self._raw_data[1]))
+        data_m = self._raw_data[2]
+
+        if method == 'nearest':
+            # Build the spatial index once and reuse it for every interpolated quantity;
+            # griddata would rebuild the same kd-tree for each call.
+            tree = ss.cKDTree(data_hhr)
+            query_pts = np.column_stack((_h.ravel(), _hr.ravel()))
+
+            # Query in tiles so the scratch buffers stay cache-resident, and let cKDTree fan
+            # each tile out across all cores (query releases the GIL).
+            indices = np.empty(query_pts.shape[0], dtype=np.intp)
+            chunk = 65536
+            for start in range(0, query_pts.shape[0], chunk):
+                _, indices[start:start+chunk] = tree.query(query_pts[start:start+chunk], workers=-1)
+
+            _m = data_m[indices].reshape(_h.shape)
+            if self.temperature is not None:
+                self.temperature = self._raw_data[3][indices].reshape(_h.shape)
+        else:
+            # Build the Delaunay triangulation once and share it between every interpolated
+            # quantity; griddata would re-run Qhull for each call.
+            tri = ss.Delaunay(data_hhr)
+            if method == 'cubic':
+                interpolator = si.CloughTocher2DInterpolator
+            elif method == 'linear':
+                interpolator = si.LinearNDInterpolator
+            else:
+                raise ValueError("Invalid interpolation method: {}".format(method))
 
-        _m = si.griddata(np.array(data_hhr), np.array(data_m), (_h, _hr), method=method)
-        if self.temperature is not None:
-            data_T = [self.temperature[i][j] for i in range(len(self.h)) for j in range(len(self.h[i]))]
-            self.temperature = si.griddata(np.array(data_hhr), np.array(data_T), (_h, _hr), method=method)
+            _m = interpolator(tri, data_m)(_h, _hr)
+            if self.temperature is not None:
+                self.temperature = interpolator(tri, self._raw_data[3])(_h, _hr)
 
         _m[_h < _hr] = np.nan
 
-        self.h = _h
-        self.hr = _hr
-        self.m = _m
+        # Keep the interpolated grids in the storage dtype: the interpolators emit float64,
+        # but with the float32 default this halves the memory traffic of every downstream
+        # kernel (the convolver still accumulates in float64). No-op copies are elided.
+        self.h = _h.astype(self.dtype, copy=False)
+        self.hr = _hr.astype(self.dtype, copy=False)
+        self.m = _m.astype(self.dtype, copy=False)
+        if self.temperature is not None:
+            self.temperature = self.temperature.astype(self.dtype, copy=False)
 
         return
 
     def _drift_correction(self, radius=4, density=3):
         # TODO: make this python-free
-
-        kernel_size = 2*radius+1
-        kernel = np.ones(kernel_size)/kernel_size
+        import scipy.interpolate as si
+        import scipy.ndimage.filters as snf
 
         average_drift = np.mean(self.drift_points)
-        moving_average = snf.convolve(self.drift_points, kernel, mode='nearest')
+        # uniform_filter1d computes the same boxcar average as a general convolution with a
+        # uniform kernel, but as a running sum whose cost is independent of the radius.
+        moving_average = snf.uniform_filter1d(np.asarray(self.drift_points, dtype=np.float64),
+                                              size=2*radius+1, mode='nearest')
         interpolated_drift_indices = np.arange(start=0, stop=len(self.drift_points), step=1)
 
         decimated_drift_indices = np.arange(start=0, stop=len(self.drift_points), step=density)
@@ -365,13 +482,15 @@ class PMCForc(ForcBase):
             decimated_drift_indices = np.hstack((decimated_drift_indices, np.array(interpolated_drift_indices[-1:])))
             decimated_values = np.hstack((decimated_values, np.array(moving_average[-1])))
 
-        interpolated_drift = si.interp1d(decimated_drift_indices, decimated_values, kind='cubic')
+        interpolated_drift = si.CubicSpline(decimated_drift_indices, decimated_values)
 
-        for i in interpolated_drift_indices:
-            drift = (interpolated_drift(i) - average_drift)
-            self.drift_points[i] -= drift
-            for j in range(len(self.m[i])):
-                self.m[i][j] -= drift
+        # Evaluate the drift for all curves in one vectorized call, then expand it to one
+        # value per sample and subtract it from the packed moment row in a single pass; the
+        # per-curve views in self.m alias that row, so they see the correction too.
+        drift = interpolated_drift(interpolated_drift_indices) - average_drift
+        self.drift_points -= drift
+        lengths = np.diff(np.concatenate(([0], self._curve_boundaries, [self._raw_data.shape[1]])))
+        self._raw_data[2] -= np.repeat(drift, lengths)
 
         return
 
@@ -379,19 +498,20 @@ class PMCForc(ForcBase):
         """Cache the limits of the data in hhr space to make plotting faster.
 
         """
-        self._h_min = np.min(self.h)
-        self._h_max = np.max(self.h)
-        self._hr_min = np.min(self.hr)
-        self._hr_max = np.max(self.hr)
-        self._m_min = np.nanmin(self.m)
-        self._m_max = np.nanmax(self.m)
-
-        if self.temperature is None or np.all(np.isnan(self.temperature)):
+        # Each array is scanned once for both extremes instead of once per reduction.
+        self._h_min, self._h_max = util.nanminmax(self.h)
+        self._hr_min, self._hr_max = util.nanminmax(self.hr)
+        self._m_min, self._m_max = util.nanminmax(self.m)
+
+        if self.temperature is None:
             self._T_min = np.nan
             self._T_max = np.nan
         else:
-            self._T_min = np.nanmin(self.temperature)
-            self._T_max = np.nanmax(self.temperature)
+            self._T_min, self._T_max = util.nanminmax(self.temperature)
+
+        # Cache the unmeasured-region mask so repeated get_masked calls (every plot refresh)
+        # skip both the subtraction and the comparison.
+        self._unmeasured_mask = self.h < self.hr - 0.5*self.step
 
         return
 
@@ -404,16 +524,18 @@ class PMCForc(ForcBase):
     def hc_range(self, mask=True):
         hc, _ = self._hchb()
         if mask is True or mask.lower() == 'h<hr':
-            return (np.min(hc[np.nonzero(1 - np.isnan(hc + self.m))]),
-                    np.max(hc[np.nonzero(1 - np.isnan(hc + self.m))]))
+            # Blank out hc wherever m is nan, then let the nan-aware reductions find the
+            # range directly — no int temporary and no index array.
+            masked = np.where(np.isnan(self.m), np.nan, hc)
+            return (np.nanmin(masked), np.nanmax(masked))
         else:
             return (np.min(hc), np.max(hc))
 
     def hb_range(self, mask=True):
         _, hb = self._hchb()
         if mask is True or mask.lower() == 'h<hr':
-            return (np.min(hb[np.nonzero(1 - np.isnan(hb + self.m))]),
-                    np.max(hb[np.nonzero(1 - np.isnan(hb + self.m))]))
+            masked = np.where(np.isnan(self.m), np.nan, hb)
+            return (np.nanmin(masked), np.nanmax(masked))
         else:
             return (np.min(hb), np.max(hb))
 
@@ -442,8 +564,14 @@ class PMCForc(ForcBase):
         if method == 'truncate':
             return
 
-        h_extend, hr_extend = np.meshgrid(np.arange(self._h_min - 2*sf*self.step, self._h_min, self.step),
-                                          np.arange(self._hr_min, self._hr_max+self.step, self.step))
+        # The extension grid is derived from the interpolated grid itself rather than from a
+        # fresh arange over the cached bounds: with float32 storage the rounded bounds can
+        # make arange produce one row more or fewer than the grid has, and the row counts
+        # must match exactly for the concatenation below. Offsets are computed in float64 so
+        # the column spacing stays uniform regardless of the storage dtype.
+        offsets = self.step*np.arange(-2*sf, 0, dtype=np.float64)
+        h_extend = (self.h[:, :1].astype(np.float64) + offsets).astype(self.dtype)
+        hr_extend = np.repeat(self.hr[:, :1], 2*sf, axis=1)
 
         self.h = np.concatenate((h_extend, self.h), axis=1)
         self.hr = np.concatenate((hr_extend, self.hr), axis=1)
@@ -459,6 +587,11 @@ class PMCForc(ForcBase):
         if self.temperature is not None:
             self.temperature = np.concatenate((h_extend*np.nan, self.temperature), axis=1)
 
+        # The in-place widening invalidates the cached unmeasured-region mask; refresh it so
+        # get_masked keeps working on this instance (it stays reachable, e.g. in the GUI's
+        # undo history) even though compute_forc_distribution returns a new object.
+        self._unmeasured_mask = self.h < self.hr - 0.5*self.step
+
         # Not necessary, as this function should never be called outside compute_forc_distribution,
         # which returns a new PMCForc instance which does this anyway
         # self._update_data_range()
@@ -467,24 +600,70 @@ class PMCForc(ForcBase):
 
     @classmethod
     def _compute_forc_sg(cls, m, sf, step_x, step_y):
-        kernel = cls._sg_kernel(sf, step_x, step_y)
-        # return snf.convolve(m, kernel, mode='constant', cval=np.nan)
-        return -0.5*util.fast_symmetric_convolve(m, kernel)
+        # The xy kernel is a rank-1 outer product, so the 2-D convolution separates into a
+        # horizontal and a vertical 1-D pass: 2*(2sf+1) multiplies per output instead of
+        # (2sf+1)**2. NaN propagation is unchanged — any window containing a NaN still
+        # produces NaN, since the first pass spreads it along rows and the second along
+        # columns.
+        kernel_x, kernel_y = cls._sg_kernel(sf, step_x, step_y)
+
+        if m.size > SG_GPU_THRESHOLD:
+            # The stencil is embarrassingly data-parallel, so grids large enough to amortize
+            # the host/device copies go to the GPU when cupy is installed. The kernel is
+            # symmetric under 180-degree rotation (both 1-D factors are antisymmetric), so
+            # ndimage convolution matches the correlation the CPU stencil computes, and nan
+            # padding plus nan propagation through the products reproduce its masking.
+            try:
+                import cupy as cp
+                import cupyx.scipy.ndimage as cnd
+            except ImportError:
+                pass
+            else:
+                kernel = -0.5*np.outer(kernel_y, kernel_x)
+                rho = cnd.convolve(cp.asarray(m, dtype=np.float64), cp.asarray(kernel),
+                                   mode='constant', cval=np.nan)
+                return cp.asnumpy(rho)
+
+        if 2*sf+1 >= SG_FFT_THRESHOLD:
+            # FFT convolution does O(log N) work per output regardless of kernel size. NaNs
+            # are zero-filled for the transform; any window touching a NaN, and the border
+            # of width sf, are re-masked afterwards to match the direct stencil.
+            import scipy.signal as ssig
+            kernel = -0.5*np.outer(kernel_y, kernel_x)
+            rho = ssig.fftconvolve(np.where(np.isnan(m), 0.0, m), kernel, mode='same')
+            invalid = ssig.fftconvolve(np.isnan(m).astype(np.float64),
+                                       np.ones_like(kernel), mode='same') > 0.5
+            rho[invalid] = np.nan
+            rho[:sf, :] = np.nan
+            rho[-sf:, :] = np.nan
+            rho[:, :sf] = np.nan
+            rho[:, -sf:] = np.nan
+            return rho
+
+        # The convolver is specialized on sf so the tap loops unroll; compiled variants are
+        # cached in util, so repeat computes with the same sf skip compilation. Contiguity
+        # is guaranteed here so numba compiles the C-contiguous (SIMD-friendly) variant
+        # rather than the strided-load fallback; for the usual concatenate-produced m this
+        # is a no-op.
+        return util.sg_convolver(sf)(np.ascontiguousarray(m), kernel_x, kernel_y, -0.5)
 
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def _sg_kernel(sf, step_x, step_y):
+        """Return the two 1-D Savitzky-Golay kernels whose outer product extracts the xy
+        cross-term of a local order-2 polynomial fit. Cached on (sf, step_x, step_y), since
+        plot sweeps recompute the distribution with the same kernel over and over; callers
+        must not modify the returned arrays.
+
+        On the symmetric fit grid the xy basis function is orthogonal to the five others, so
+        the least-squares coefficient reduces to the analytic form x*y / (sum(x^2)*sum(y^2))
+        — no design matrix or pseudoinverse needed, and the kernel factorizes exactly.
+        """
 
-        xx, yy = np.meshgrid(np.linspace(sf*step_x, -sf*step_x, 2*sf+1),
-                             np.linspace(sf*step_y, -sf*step_y, 2*sf+1))
-
-        xx = np.reshape(xx, (-1, 1))
-        yy = np.reshape(yy, (-1, 1))
-
-        coefficients = np.linalg.pinv(np.hstack((np.ones_like(xx), xx, xx**2, yy, yy**2, xx*yy)))
-
-        kernel = np.reshape(coefficients[5, :], (2*sf+1, 2*sf+1))
+        x = np.linspace(sf*step_x, -sf*step_x, 2*sf+1)
+        y = np.linspace(sf*step_y, -sf*step_y, 2*sf+1)
 
-        return kernel
+        return x/np.sum(x**2), y/np.sum(y**2)
 
     def compute_forc_distribution(self, sf=3, method='savitzky-golay', extension='flat', n_fit_points=10):
 
@@ -499,23 +678,23 @@ class PMCForc(ForcBase):
         else:
             raise NotImplementedError("method {} not implemented for FORC distribution calculation".format(method))
 
-        return PMCForc(h=self.h, hr=self.hr, m=self.m, rho=rho, T=self.temperature)
+        return PMCForc(h=self.h, hr=self.hr, m=self.m, rho=rho, T=self.temperature,
+                       dtype=self.dtype)
 
     @classmethod
     def _extend_flat(cls, h, m):
-        for i in range(m.shape[0]):
-            first_data_index = util.arg_first_not_nan(m[i])
-            m[i, 0:first_data_index] = m[i, first_data_index]
+        # Fill everything left of each row's first valid point with that point, in one pass:
+        # fancy assignment walks the masked elements in row-major order, which is exactly the
+        # order np.repeat produces the fill values in.
+        first = (~np.isnan(m)).argmax(axis=1)
+        fill = m[np.arange(m.shape[0]), first]
+        mask = np.arange(m.shape[1])[np.newaxis, :] < first[:, np.newaxis]
+        m[mask] = np.repeat(fill, first)
         return
 
     @classmethod
     def _extend_slope(cls, h, m, n_fit_points=10):
-        for i in range(m.shape[0]):
-
-            j = util.arg_first_not_nan(m[i])
-            popt, _ = so.curve_fit(util.line, h[i, j:j+n_fit_points], m[i, j:j+n_fit_points])
-            m[i, 0:j] = util.line(h[i, 0:j], *popt)
-
+        util.extend_slope(h, m, n_fit_points)
         return
 
     def major_loop(self):
@@ -529,27 +708,34 @@ class PMCForc(ForcBase):
             h-values, hr-values, m-values as 1D arrays.
         """
 
+        # The measured-region mask is computed once and reused for every branch of the loop.
+        valid = self.h >= self.hr[:, :1]
+
         upper_curve = self.shape[0]-1
-        upper_curve_length = np.sum(self.h[upper_curve] >= self.hr[upper_curve, 0])
-        h = np.empty(2*(self.shape[0]+upper_curve_length-1)-1)*0
-        hr = np.empty(2*(self.shape[0]+upper_curve_length-1)-1)*0
-        m = np.empty(2*(self.shape[0]+upper_curve_length-1)-1)*0
-
-        for i in range(upper_curve_length-1):
-            pt_index = self.shape[1]-1-i
-            h[i] = self.h[upper_curve, pt_index]
-            hr[i] = self.hr[upper_curve, pt_index]
-            m[i] = self.m[upper_curve, pt_index]
-        for i in range(self.shape[0]):
-            forc_index = self.shape[0]-1-i
-            major_loop_index = upper_curve_length-1+i
-            h[major_loop_index] = self.hr[forc_index, 0]
-            hr[major_loop_index] = self.hr[forc_index, 0]
-            m[major_loop_index] = self.m[forc_index, self.h[forc_index] >= self.hr[forc_index, 0]][0]
-
-        h[self.shape[0]+upper_curve_length-2:] = self.h[0, self.h[0] >= self.hr[0, 0]]
-        hr[self.shape[0]+upper_curve_length-2:] = self.hr[0, self.h[0] >= self.hr[0, 0]]
-        m[self.shape[0]+upper_curve_length-2:] = self.m[0, self.h[0] >= self.hr[0, 0]]
+        upper_curve_length = int(np.sum(valid[upper_curve]))
+        size = 2*(self.shape[0]+upper_curve_length-1)-1
+        h = np.empty(size)
+        hr = np.empty(size)
+        m = np.empty(size)
+
+        # Descending branch: the uppermost curve, walked backwards from its last point.
+        top = slice(self.shape[1]-1, self.shape[1]-upper_curve_length, -1)
+        h[:upper_curve_length-1] = self.h[upper_curve, top]
+        hr[:upper_curve_length-1] = self.hr[upper_curve, top]
+        m[:upper_curve_length-1] = self.m[upper_curve, top]
+
+        # Reversal points, one per curve, highest reversal field first.
+        rows = np.arange(self.shape[0])[::-1]
+        first_valid = valid.argmax(axis=1)[rows]
+        mid = slice(upper_curve_length-1, upper_curve_length-1+self.shape[0])
+        h[mid] = self.hr[rows, 0]
+        hr[mid] = self.hr[rows, 0]
+        m[mid] = self.m[rows, first_valid]
+
+        # Ascending branch: the lowermost curve.
+        h[self.shape[0]+upper_curve_length-2:] = self.h[0, valid[0]]
+        hr[self.shape[0]+upper_curve_length-2:] = self.hr[0, valid[0]]
+        m[self.shape[0]+upper_curve_length-2:] = self.m[0, valid[0]]
 
         return h, hr, m
 
@@ -561,28 +747,27 @@ class PMCForc(ForcBase):
                 first_non_nan = util.arg_first_not_nan(self.m[self.shape[0]-1])
                 last_non_nan = util.arg_last_non_nan(self.m[self.shape[0]-1])
 
-                popt, _ = so.curve_fit(util.line,
-                                       self.h[self.shape[0]-1, first_non_nan:last_non_nan],
-                                       self.m[self.shape[0]-1, first_non_nan:last_non_nan])
-                value = popt[0]
+                # The model is a straight line, so the closed-form least-squares slope
+                # replaces an iterative curve_fit solve.
+                value = np.polyfit(self.h[self.shape[0]-1, first_non_nan:last_non_nan],
+                                   self.m[self.shape[0]-1, first_non_nan:last_non_nan], 1)[0]
 
             else:
                 index_h_sat = np.argwhere(self.h[0] > h_sat)[0][0]
                 h_gt_h_sat = self.h[0, index_h_sat:]
                 m_gt_h_sat = self.m[:, index_h_sat:]
-                average_m = np.nansum(m_gt_h_sat, axis=0)/np.nansum(np.logical_not(np.isnan(m_gt_h_sat)), axis=0)
-                popt, _ = so.curve_fit(util.line, h_gt_h_sat, average_m)
-                value = popt[0]
+                average_m = np.nanmean(m_gt_h_sat, axis=0)
+                value = np.polyfit(h_gt_h_sat, average_m, 1)[0]
 
-        return PMCForc(h=self.h, hr=self.hr, m=self.m - (value*self.h), T=self.temperature, rho=self.rho)
+        return PMCForc(h=self.h, hr=self.hr, m=self.m - (value*self.h), T=self.temperature, rho=self.rho,
+                       dtype=self.dtype)
 
     def get_masked(self, data, mask):
         mask = mask is True or mask.lower() == 'h<hr'
 
         if mask:
-            masked_data = data.copy()
-            masked_data[self.h < self.hr-0.5*self.step] = np.nan
-            return masked_data
+            # One fused pass instead of copy-then-scatter, using the cached mask.
+            return np.where(self._unmeasured_mask, data.dtype.type(np.nan), data)
         else:
             return data
 
@@ -604,25 +789,30 @@ class PMCForc(ForcBase):
 
     def normalize(self, method='minmax'):
         if method == 'minmax':
+            # One fused scan for both extremes, and a precomputed reciprocal so the
+            # elementwise pass multiplies instead of dividing.
+            m_min, m_max = util.nanminmax(self.m)
+            inv_range = 1.0/(m_max - m_min)
             return PMCForc(h=self.h,
                            hr=self.hr,
-                           m=1-2*(np.nanmax(self.m)-self.m)/(np.nanmax(self.m)-np.nanmin(self.m)),
+                           m=1-2*(m_max-self.m)*inv_range,
                            rho=self.rho,
-                           T=self.temperature)
+                           T=self.temperature,
+                           dtype=self.dtype)
         else:
             raise NotImplementedError
 
     def has_m(self):
-        return np.any(1 - np.isnan(self.m))
+        return np.isfinite(self.m).any()
 
     def has_rho(self):
-        return np.any(1 - np.isnan(self.m))
+        return np.isfinite(self.m).any()
 
     def has_rho_uncertainty(self):
-        return np.any(1 - np.isnan(self.m))
+        return np.isfinite(self.m).any()
 
     def has_temperature(self):
-        return np.any(1 - np.isnan(self.m))
+        return np.isfinite(self.m).any()
 
     def export_csv(self, path):
         """Export the data in csv format. Columns are
@@ -37,4 +37,59 @@ class MplWidget(QtWidgets.QWidget):
 
         self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         self.updateGeometry()
+
+        # Blitting support: the static background (axes, ticks, labels) is cached on every
+        # full draw, so repeat plots only need to redraw the registered animated artists.
+        self._background = None
+        self._animated_artists = []
+        self.figurecanvas.mpl_connect('draw_event', self._on_draw)
+        return
+
+    def _on_draw(self, event):
+        """Cache the figure background whenever a full draw happens (first render, resize,
+        toolbar pan/zoom), then paint the animated artists on top of it.
+
+        Parameters
+        ----------
+        event : matplotlib.backend_bases.DrawEvent
+            Draw event from the canvas.
+        """
+
+        self._background = self.figurecanvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+        return
+
+    def _draw_animated(self):
+        for artist in self._animated_artists:
+            self.axes.draw_artist(artist)
+        return
+
+    def add_animated_artist(self, artist):
+        """Register an artist to be managed by blitting. The artist is excluded from full
+        draws and repainted over the cached background on blit_update.
+
+        Parameters
+        ----------
+        artist : matplotlib.artist.Artist
+            Artist (Line2D, QuadMesh, ...) whose data will be updated in place.
+        """
+
+        artist.set_animated(True)
+        self._animated_artists.append(artist)
+        return
+
+    def blit_update(self):
+        """Redraw only the animated artists over the cached background instead of
+        re-rendering the whole figure. Falls back to a full draw if no background has been
+        captured yet.
+        """
+
+        if self._background is None:
+            self.figurecanvas.draw()
+            return
+
+        self.figurecanvas.restore_region(self._background)
+        self._draw_animated()
+        self.figurecanvas.blit(self.fig.bbox)
+        self.figurecanvas.flush_events()
         return
@@ -1,6 +1,6 @@
 from PyQt5 import QtWidgets, QtGui, QtCore
 import PyFORCGUIBase
-import multiprocessing as mp
+import queue
 import worker
 import plotting
 import Forc
@@ -23,20 +23,25 @@ log = logging.getLogger(__name__)
 
 class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
 
-    send_latest_data = QtCore.pyqtSignal()
-
     def __init__(self, app):
         QtWidgets.QMainWindow.__init__(self)
         self.setupUi(self)
         self._setup_buttons()
 
         self.current_job = 0
+        self._latest_data = None
+
+        # Icons are loaded once here; constructing a QIcon in the status handlers re-reads
+        # and re-decodes the png on every job.
+        self._icon_done = QtGui.QIcon('./checkmark.png')
+        self._icon_pending = QtGui.QIcon('./hourglass.png')
 
         # Set up thread which does work for the GUI behind the scenes
         log.info("Starting worker thread.")
-        self.queued_jobs = mp.Queue()
-        self.data_queue = mp.Queue()
-        self.worker = worker.WorkerThread(input_queue=self.queued_jobs, data_queue=self.data_queue, parent=self)
+        # The worker is a QThread in this process, so a plain queue.Queue hand-off suffices:
+        # jobs move by reference instead of being pickled through an mp.Queue pipe.
+        self.queued_jobs = queue.Queue()
+        self.worker = worker.WorkerThread(input_queue=self.queued_jobs, parent=self)
         app.aboutToQuit.connect(self.worker.quit)
         self.worker.job_done.connect(self.update_status)
         self.worker.start()
@@ -64,9 +69,10 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         return
 
     def closeEvent(self, event):
-        """Stops the worker thread and quits the application. PyQt5 QThread documentation says to avoid using
-        terminate(), but I get a 'QThread destroyed' error if I don't terminate - and the application hangs
-        if I try to use QThread.quit() and QThread.wait(). This function should never be called directly by the user.
+        """Stops the worker thread and quits the application. A stop sentinel is queued so the
+        worker exits its run loop cleanly; terminate() remains only as a last resort if the
+        worker is stuck in a long computation when the window closes. This function should
+        never be called directly by the user.
 
         Parameters
         ----------
@@ -74,7 +80,9 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
             A QCloseEvent is passed in when the 'x' button is clicked to close PyFORC.
         """
 
-        self.worker.terminate()
+        self.queued_jobs.put(worker.STOP)
+        if not self.worker.wait(500):
+            self.worker.terminate()
         event.accept()
         return
 
@@ -242,9 +250,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.h_vs_m(ax=self.p_paths.axes,
-                        forc=self.data_queue.get(),
+                        forc=self.latest_data(),
                         mask=self.f_paths_mask.currentText(),
                         points=self.f_paths_points.currentText(),
                         cmap=self.f_paths_cmap.currentText())
@@ -256,9 +263,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.major_loop(ax=self.p_paths.axes,
-                            forc=self.data_queue.get(),
+                            forc=self.latest_data(),
                             color='k')
         self.tabWidget.setCurrentIndex(0)
         return
@@ -268,9 +274,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.plot_points(ax=self.p_map.axes,
-                             forc=self.data_queue.get(),
+                             forc=self.latest_data(),
                              coordinates=self.coordinates())
         self.tabWidget.setCurrentIndex(1)
         return
@@ -316,9 +321,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
 
         """
 
-        self.send_latest_data.emit()
         plotting.heat_map(ax=self.p_map.axes,
-                          forc=self.data_queue.get(),
+                          forc=self.latest_data(),
                           data_str='m',
                           mask=self.f_2d_mask.currentText(),
                           coordinates=self.coordinates(),
@@ -331,9 +335,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.heat_map(ax=self.p_map.axes,
-                          forc=self.data_queue.get(),
+                          forc=self.latest_data(),
                           data_str='rho',
                           mask=self.f_2d_mask.currentText(),
                           coordinates=self.coordinates(),
@@ -346,9 +349,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.heat_map(ax=self.p_map.axes,
-                          forc=self.data_queue.get(),
+                          forc=self.latest_data(),
                           data_str='rho_uncertainty',
                           mask=self.f_2d_mask.currentText(),
                           coordinates=self.coordinates(),
@@ -361,9 +363,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.heat_map(ax=self.p_map.axes,
-                          forc=self.data_queue.get(),
+                          forc=self.latest_data(),
                           data_str='temperature',
                           mask=self.f_2d_mask.currentText(),
                           coordinates=self.coordinates(),
@@ -376,9 +377,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.contour_map(ax=self.p_map.axes,
-                             forc=self.data_queue.get(),
+                             forc=self.latest_data(),
                              data_str='m',
                              mask=self.f_2d_mask.currentText(),
                              coordinates=self.coordinates(),
@@ -391,9 +391,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.contour_map(ax=self.p_map.axes,
-                             forc=self.data_queue.get(),
+                             forc=self.latest_data(),
                              data_str='rho',
                              mask=self.f_2d_mask.currentText(),
                              coordinates=self.coordinates(),
@@ -406,9 +405,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.contour_map(ax=self.p_map.axes,
-                             forc=self.data_queue.get(),
+                             forc=self.latest_data(),
                              data_str='rho_uncertainty',
                              mask=self.f_2d_mask.currentText(),
                              coordinates=self.coordinates(),
@@ -421,9 +419,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.contour_map(ax=self.p_map.axes,
-                             forc=self.data_queue.get(),
+                             forc=self.latest_data(),
                              data_str='temperature',
                              mask=self.f_2d_mask.currentText(),
                              coordinates=self.coordinates(),
@@ -436,9 +433,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.contour_levels(ax=self.p_map.axes,
-                                forc=self.data_queue.get(),
+                                forc=self.latest_data(),
                                 data_str='m',
                                 mask=self.f_2d_mask.currentText(),
                                 coordinates=self.coordinates())
@@ -450,9 +446,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.contour_levels(ax=self.p_map.axes,
-                                forc=self.data_queue.get(),
+                                forc=self.latest_data(),
                                 data_str='rho',
                                 mask=self.f_2d_mask.currentText(),
                                 coordinates=self.coordinates())
@@ -464,9 +459,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
         
-        self.send_latest_data.emit()
         plotting.contour_levels(ax=self.p_map.axes,
-                                forc=self.data_queue.get(),
+                                forc=self.latest_data(),
                                 data_str='rho_uncertainty',
                                 mask=self.f_2d_mask.currentText(),
                                 coordinates=self.coordinates())
@@ -478,9 +472,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.contour_levels(ax=self.p_map.axes,
-                                forc=self.data_queue.get(),
+                                forc=self.latest_data(),
                                 data_str='temperature',
                                 mask=self.f_2d_mask.currentText(),
                                 coordinates=self.coordinates())
@@ -492,9 +485,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.map_into_curves(ax=self.p_map_in_paths.axes,
-                                 forc=self.data_queue.get(),
+                                 forc=self.latest_data(),
                                  data_str='m',
                                  mask=self.f_2d_mask.currentText(),
                                  interpolation=None)
@@ -506,9 +498,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.map_into_curves(ax=self.p_map_in_paths.axes,
-                                 forc=self.data_queue.get(),
+                                 forc=self.latest_data(),
                                  data_str='rho',
                                  mask=self.f_2d_mask.currentText(),
                                  interpolation=None)
@@ -520,9 +511,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.map_into_curves(ax=self.p_map_in_paths.axes,
-                                 forc=self.data_queue.get(),
+                                 forc=self.latest_data(),
                                  data_str='rho_uncertainty',
                                  mask=self.f_2d_mask.currentText(),
                                  interpolation=None)
@@ -534,9 +524,8 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
         plotting.map_into_curves(ax=self.p_map_in_paths.axes,
-                                 forc=self.data_queue.get(),
+                                 forc=self.latest_data(),
                                  data_str='temperature',
                                  mask=self.f_2d_mask.currentText(),
                                  interpolation=None)
@@ -552,8 +541,24 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
             self.worker.undo()
             self.d_jobs.takeItem(self.d_jobs.count()-1)
             self.current_job -= 1
+            self._latest_data = None
         return
 
+    def latest_data(self):
+        """Return the most recently computed FORC dataset. The reference is cached so that
+        back-to-back plot clicks on the same data don't go through the worker queue at all;
+        the cache is invalidated whenever a job finishes or is undone.
+
+        Returns
+        -------
+        Forc.PMCForc
+            The most recent dataset.
+        """
+
+        if self._latest_data is None:
+            self._latest_data = self.worker.get_latest_data()
+        return self._latest_data
+
     def is_job_running(self):
         """Check whether a computation is currently running or not.
 
@@ -569,8 +574,9 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         """Update display and data. Called when worker subprocess completes a job and emits a job_done signal.
 
         """
+        self._latest_data = None
         self._enable_plotting_buttons()
-        self.d_jobs.item(self.current_job).setIcon(QtGui.QIcon('./checkmark.png'))
+        self.d_jobs.item(self.current_job).setIcon(self._icon_done)
         self.current_job += 1
         return
 
@@ -597,7 +603,7 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         self.queued_jobs.put(job)
         item = QtWidgets.QListWidgetItem(text)
         item.setToolTip(text)
-        item.setIcon(QtGui.QIcon('./hourglass.png'))
+        item.setIcon(self._icon_pending)
         self.d_jobs.addItem(item)
         return
 
@@ -621,54 +627,62 @@ class PyFORCGUI(PyFORCGUIBase.Ui_MainWindow, QtWidgets.QMainWindow):
         
         """
 
-        self.send_latest_data.emit()
-        data = self.data_queue.get()
+        data = self.latest_data()
+
+        # Each has_* query scans the data, so evaluate them once, and suspend repaints so
+        # the ~20 setEnabled style recomputations coalesce into a single frame.
+        has_m = data.has_m()
+        has_rho = data.has_rho()
+        has_rho_uncertainty = data.has_rho_uncertainty()
+        has_temperature = data.has_temperature()
 
-        self.b_paths.setEnabled(data.has_m())
-        self.b_major_loop.setEnabled(data.has_m())
-        self.b_data_points.setEnabled(data.has_m())
+        self.setUpdatesEnabled(False)
+        try:
+            self.b_paths.setEnabled(has_m)
+            self.b_major_loop.setEnabled(has_m)
+            self.b_data_points.setEnabled(has_m)
 
-        self.b_hc_axis.setEnabled(data.has_m())
-        self.b_hb_axis.setEnabled(data.has_m())
-        self.b_h_axis.setEnabled(data.has_m())
-        self.b_hr_axis.setEnabled(data.has_m())
+            self.b_hc_axis.setEnabled(has_m)
+            self.b_hb_axis.setEnabled(has_m)
+            self.b_h_axis.setEnabled(has_m)
+            self.b_hr_axis.setEnabled(has_m)
 
-        self.b_heat_moment.setEnabled(data.has_m())
-        self.b_heat_rho.setEnabled(data.has_rho())
-        self.b_heat_rho_uncertainty.setEnabled(data.has_rho_uncertainty())
-        self.b_heat_temperature.setEnabled(data.has_temperature())
+            self.b_heat_moment.setEnabled(has_m)
+            self.b_heat_rho.setEnabled(has_rho)
+            self.b_heat_rho_uncertainty.setEnabled(has_rho_uncertainty)
+            self.b_heat_temperature.setEnabled(has_temperature)
 
-        self.b_contour_moment.setEnabled(data.has_m())
-        self.b_contour_rho.setEnabled(data.has_rho())
-        self.b_contour_rho_uncertainty.setEnabled(data.has_rho_uncertainty())
-        self.b_contour_temperature.setEnabled(data.has_temperature())
+            self.b_contour_moment.setEnabled(has_m)
+            self.b_contour_rho.setEnabled(has_rho)
+            self.b_contour_rho_uncertainty.setEnabled(has_rho_uncertainty)
+            self.b_contour_temperature.setEnabled(has_temperature)
 
-        self.b_level_moment.setEnabled(data.has_m())
-        self.b_level_rho.setEnabled(data.has_rho())
-        self.b_level_rho_uncertainty.setEnabled(data.has_rho_uncertainty())
-        self.b_level_temperature.setEnabled(data.has_temperature())
+            self.b_level_moment.setEnabled(has_m)
+            self.b_level_rho.setEnabled(has_rho)
+            self.b_level_rho_uncertainty.setEnabled(has_rho_uncertainty)
+            self.b_level_temperature.setEnabled(has_temperature)
 
-        self.b_map_curves_moment.setEnabled(data.has_m())
-        self.b_map_curves_rho.setEnabled(data.has_rho() and data.has_m())
-        self.b_map_curves_rho_uncertainty.setEnabled(data.has_rho_uncertainty() and data.has_m())
-        self.b_map_curves_temperature.setEnabled(data.has_temperature() and data.has_m())
+            self.b_map_curves_moment.setEnabled(has_m)
+            self.b_map_curves_rho.setEnabled(has_rho and has_m)
+            self.b_map_curves_rho_uncertainty.setEnabled(has_rho_uncertainty and has_m)
+            self.b_map_curves_temperature.setEnabled(has_temperature and has_m)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
 
         return
 
     def export_pmc(self):
-        self.send_latest_data.emit()
         path = QtWidgets.QFileDialog.getSaveFileName(self, 'Create a save file:', './test_data/')[0]
-        self.data_queue.get().export_pmc(path)
+        self.latest_data().export_pmc(path)
         return
 
     def export_vtk(self):
-        self.send_latest_data.emit()
         path = QtWidgets.QFileDialog.getSaveFileName(self, 'Create a save file:', './test_data/')[0]
-        self.data_queue.get().export_vtk(path)
+        self.latest_data().export_vtk(path)
         return
     
     def export_csv(self):
-        self.send_latest_data.emit()
         path = QtWidgets.QFileDialog.getSaveFileName(self, 'Create a save file:', './test_data/')[0]
-        self.data_queue.get().export_csv(path)
+        self.latest_data().export_csv(path)
         return
\ No newline at end of file
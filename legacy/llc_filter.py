@@ -0,0 +1,37 @@
+"""Utilities for running Numba-compiled kernels inside scipy.ndimage's generic filters."""
+import numba as nb
+from numba import types
+from scipy import LowLevelCallable
+
+
+def jit_filter_function(filter_function):
+    """Wrap a scalar filter function as a LowLevelCallable for scipy.ndimage.generic_filter.
+
+    generic_filter calls its callback once per pixel; with a Python callback that transition
+    dominates the cost of any non-trivial kernel. Compiling the callback with Numba and handing
+    scipy the raw C function pointer removes the per-pixel Python dispatch entirely, so custom
+    (non-uniform) smoothing kernels stay usable on full-size datasets.
+
+    Parameters
+    ----------
+    filter_function : callable
+        Function taking a 1D float64 array of the footprint values and returning a float.
+
+    Returns
+    -------
+    scipy.LowLevelCallable
+        Callable suitable for the function argument of scipy.ndimage.generic_filter.
+    """
+
+    jitted = nb.njit(filter_function, nogil=True)
+
+    @nb.cfunc(types.intc(types.CPointer(types.float64),
+                         types.intp,
+                         types.CPointer(types.float64),
+                         types.voidptr))
+    def wrapped(values_ptr, len_values, result, data):
+        values = nb.carray(values_ptr, (len_values,), dtype=types.float64)
+        result[0] = jitted(values)
+        return 1
+
+    return LowLevelCallable(wrapped.ctypes, signature="int (double *, npy_intp, double *, void *)")
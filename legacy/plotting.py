@@ -35,7 +35,6 @@ def h_vs_m(ax, forc, mask='h<hr', points='none', cmap='viridis', alpha=1.0):
     
     """
 
-    ax.clear()
     mask = mask.lower()
     points = points.lower()
     cmap = cmap.lower()
@@ -46,60 +45,66 @@ def h_vs_m(ax, forc, mask='h<hr', points='none', cmap='viridis', alpha=1.0):
         cmap = cm.get_cmap(cmap)
         colors = [cmap(x) for x in np.linspace(0, 0.4, forc.shape[0])]
 
-    if points in ['none', 'reversal', 'all']:
-
-        if mask.lower() == 'h<hr':
-            for i in range(forc.shape[0]):
-                h = forc.h[i]
-                m = forc.m[i]
-                ax.add_line(ml.Line2D(xdata=h[h >= forc.hr[i, 0]],
-                                      ydata=m[h >= forc.hr[i, 0]],
-                                      color=colors[i],
-                                      alpha=alpha))
-        elif mask in ['outline', 'none']:
-            for i in range(forc.shape[0]):
-                ax.add_line(ml.Line2D(xdata=forc.h[i],
-                                      ydata=forc.m[i],
-                                      color=colors[i],
-                                      alpha=alpha))
-
-            if mask == 'outline':
-                h, hr, m = forc.major_loop()
-                ax.add_line(ml.Line2D(xdata=h,
-                                      ydata=m,
-                                      linestyle=':',
-                                      color='r',
-                                      linewidth=2,
-                                      alpha=alpha))
-        else:
-            raise ValueError('Invalid mask argument: {}'.format(mask))
-
-        if points == 'reversal':
-            hr = forc.hr[:, 0]
-            m = np.zeros_like(forc.hr[:, 0])
-            for i in range(forc.shape[0]):
-                m[i] = forc.m[i, forc.h[i] >= forc.hr[i, 0]][0]
-
-            ax.add_line(ml.Line2D(xdata=hr,
-                                  ydata=m,
-                                  marker='o',
-                                  linestyle='',
-                                  color='grey',
-                                  markersize=4,
-                                  alpha=alpha))
-
-        elif points == 'all':
-            ax.add_line(ml.Line2D(xdata=forc.h,
-                                  ydata=forc.m,
-                                  marker='o',
-                                  linestyle='',
-                                  color='grey',
-                                  markersize=4,
-                                  alpha=alpha))
-
-        ax.autoscale_view()
-    else:
+    if points not in ['none', 'reversal', 'all']:
         raise ValueError('Invalid points argument: {}'.format(points))
+
+    # Each entry is (xdata, ydata, line properties) for one artist the plot needs. Building
+    # the list first lets repeated calls update the existing artists in place instead of
+    # tearing down and recreating every Line2D on each button press.
+    segments = []
+
+    if mask == 'h<hr':
+        for i in range(forc.shape[0]):
+            h = forc.h[i]
+            m = forc.m[i]
+            segments.append((h[h >= forc.hr[i, 0]],
+                             m[h >= forc.hr[i, 0]],
+                             dict(color=colors[i], alpha=alpha)))
+    elif mask in ['outline', 'none']:
+        for i in range(forc.shape[0]):
+            segments.append((forc.h[i],
+                             forc.m[i],
+                             dict(color=colors[i], alpha=alpha)))
+
+        if mask == 'outline':
+            h, hr, m = forc.major_loop()
+            segments.append((h, m, dict(linestyle=':', color='r', linewidth=2, alpha=alpha)))
+    else:
+        raise ValueError('Invalid mask argument: {}'.format(mask))
+
+    if points == 'reversal':
+        hr = forc.hr[:, 0]
+        m = np.zeros_like(forc.hr[:, 0])
+        for i in range(forc.shape[0]):
+            m[i] = forc.m[i, forc.h[i] >= forc.hr[i, 0]][0]
+
+        segments.append((hr, m, dict(marker='o', linestyle='', color='grey',
+                                     markersize=4, alpha=alpha)))
+    elif points == 'all':
+        segments.append((forc.h, forc.m, dict(marker='o', linestyle='', color='grey',
+                                              markersize=4, alpha=alpha)))
+
+    # Reuse the previous call's artists when the axes still hold exactly those lines and the
+    # styling is unchanged; anything else (first draw, different settings, or other plots
+    # having drawn onto the axes) falls back to a full rebuild.
+    style = (mask, points, alpha, [props['color'] for _, _, props in segments])
+    lines = getattr(ax, '_h_vs_m_lines', None)
+    if (lines is not None and getattr(ax, '_h_vs_m_style', None) == style
+            and list(ax.lines) == lines):
+        for artist, (x, y, _) in zip(lines, segments):
+            artist.set_data(x, y)
+        ax.relim()
+    else:
+        ax.clear()
+        lines = []
+        for x, y, props in segments:
+            artist = ml.Line2D(xdata=x, ydata=y, **props)
+            ax.add_line(artist)
+            lines.append(artist)
+        ax._h_vs_m_lines = lines
+        ax._h_vs_m_style = style
+
+    ax.autoscale_view()
     ax.figure.canvas.draw()
     return
 
@@ -168,6 +173,32 @@ def plot_points(ax, forc, coordinates):
     return
 
 
+def downsample_for_display(ax, data):
+    """Stride a 2D dataset down to roughly the on-screen resolution of the axes.
+
+    The canvas can only show as many data points as the axes occupy in pixels; rasterizing a
+    grid much denser than that burns time on pixels which are discarded. Strided slicing
+    keeps the array's extent, so the plot coordinates are unaffected.
+
+    Parameters
+    ----------
+    ax : Axes
+        Axes the data will be drawn on.
+    data : ndarray
+        2D dataset to be displayed.
+
+    Returns
+    -------
+    ndarray
+        View of data, strided down to approximately the axes' pixel resolution.
+    """
+
+    bbox = ax.get_window_extent()
+    stride_y = max(1, data.shape[0] // max(1, int(bbox.height)))
+    stride_x = max(1, data.shape[1] // max(1, int(bbox.width)))
+    return data[::stride_y, ::stride_x]
+
+
 def heat_map(ax, forc, data_str, mask, coordinates, interpolation='nearest', cmap='RdBu_r'):
     """Plot a 2D heat map of a dataset in (H, Hr) or (Hc, Hb) space.
 
@@ -194,7 +225,9 @@ def heat_map(ax, forc, data_str, mask, coordinates, interpolation='nearest', cma
 
     ax.clear()
     data = forc.get_masked(forc.get_data(data_str), mask)
+    # Color limits come from the full dataset; only the rasterized pixels are strided.
     vmin, vmax = symmetrize_bounds(np.nanmin(data), np.nanmax(data))
+    data = downsample_for_display(ax, data)
     im = ax.imshow(data,
                    extent=forc.get_extent('hhr'),
                    cmap=cmap,
@@ -238,6 +271,7 @@ def contour_map(ax, forc, data_str, mask, coordinates, interpolation='nearest',
     ax.clear()
     data = forc.get_masked(forc.get_data(data_str), mask)
     vmin, vmax = symmetrize_bounds(np.nanmin(data), np.nanmax(data))
+    data = downsample_for_display(ax, data)
     im = ax.contourf(data,
                      extent=forc.get_extent('hhr'),
                      cmap=cmap,
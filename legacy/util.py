@@ -2,64 +2,205 @@ import numpy as np
 import numba as nb
 
 
-@nb.jit(nb.float64[:, :](nb.float64[:, :], nb.float64[:, :]), nopython=True, nogil=True)
-def fast_symmetric_convolve(input, kernel):
-    result = np.empty_like(input, dtype=np.float64)*np.nan
-    sf_y, sf_x = (kernel.shape[0]-1)//2, (kernel.shape[1]-1)//2
-    for i in range(sf_y, input.shape[0]-sf_y):
-        for j in range(sf_x, input.shape[1]-sf_x):
-            result[i, j] = 0
-            for m in range(-sf_y, sf_y+1):
-                for n in range(-sf_x, sf_x+1):
-                    result[i, j] += input[i+m, j+n]*kernel[m+sf_y, n+sf_x]
+# Tile sizes for the blocked stencil traversal in fast_symmetric_convolve. The row band a
+# tile touches (CONV_BLOCK_X + 2*sf_x doubles per row) should fit in L1 so each input
+# element is reused from cache across the kernel window. Tunable per machine; numba bakes
+# them in at compile time, so changes take effect on recompilation.
+CONV_BLOCK_Y = 64
+CONV_BLOCK_X = 256
+
+
+# fastmath is restricted to reassociation/contraction so that nan windows still propagate
+# nan into the output, which the masking downstream relies on.
+@nb.jit(nopython=True, nogil=True, parallel=True, cache=True,
+        fastmath={'reassoc', 'contract'})
+def fast_symmetric_convolve(input, kernel, scale=1.0):
+    # scale is folded into the output write so callers don't need a separate full-array
+    # multiply pass afterwards.
+    H, W = input.shape
+    ky, kx = kernel.shape
+    sf_y, sf_x = (ky-1)//2, (kx-1)//2
+    # Hoisted locals and a flat kernel buffer keep the inner loop down to one fused
+    # multiply-add per tap with a single strength-reduced index computation.
+    k_flat = kernel.ravel()
+    # The interior is overwritten below, so only the border margins need the nan fill.
+    result = np.empty(input.shape)
+    result[:sf_y, :] = np.nan
+    result[H-sf_y:, :] = np.nan
+    result[:, :sf_x] = np.nan
+    result[:, W-sf_x:] = np.nan
+    # Blocked traversal: each tile's input rows stay hot in cache while the kernel window
+    # sweeps over them, instead of streaming the whole array once per output row band.
+    # prange threads the row-block loop; blocks write disjoint output tiles.
+    n_blocks_y = (H - 2*sf_y + CONV_BLOCK_Y - 1)//CONV_BLOCK_Y
+    for bi in nb.prange(n_blocks_y):
+        i0 = sf_y + bi*CONV_BLOCK_Y
+        i1 = min(i0 + CONV_BLOCK_Y, H-sf_y)
+        for j0 in range(sf_x, W-sf_x, CONV_BLOCK_X):
+            j1 = min(j0 + CONV_BLOCK_X, W-sf_x)
+            for i in range(i0, i1):
+                for j in range(j0, j1):
+                    acc = 0.0
+                    for m in range(ky):
+                        for n in range(kx):
+                            acc += input[i-sf_y+m, j-sf_x+n]*k_flat[m*kx + n]
+                    result[i, j] = scale*acc
 
     return result
 
 
 # @nb.jit(nb.float64(nb.float64, nb.float64, nb.float64), nopython=True, nogil=True)
-@nb.jit(nopython=True, nogil=True)
+@nb.jit(nopython=True, nogil=True, cache=True)
 def line(x, a, b):
     return a*x+b
 
 
-# @nb.jit(nb.int64(nb.float64[:]), nopython=True, nogil=True)
-# @nb.jit(nopython=True, nogil=True)
+@nb.jit(nopython=True, nogil=True, cache=True)
+def nanminmax(arr):
+    # Both extremes in one fused pass; separate nanmin/nanmax calls traverse the array twice.
+    # Returns (nan, nan) for all-nan input, like the nan-aware numpy reductions.
+    flat = arr.ravel()
+    lo = np.inf
+    hi = -np.inf
+    for i in range(flat.shape[0]):
+        v = flat[i]
+        if not np.isnan(v):
+            lo = min(lo, v)
+            hi = max(hi, v)
+    if lo > hi:
+        return np.nan, np.nan
+    return lo, hi
+
+
+@nb.jit(nopython=True, nogil=True, parallel=True, cache=True)
+def extend_slope(h, m, n_fit_points):
+    # Rows are independent, so prange threads them; each row does one fused scan — find the
+    # first valid point, accumulate the closed-form least-squares sums over the fit window,
+    # and fill everything left of the data with the fitted line. No temporaries.
+    for i in nb.prange(m.shape[0]):
+        j = 0
+        while j < m.shape[1] and np.isnan(m[i, j]):
+            j += 1
+        if j == 0 or j == m.shape[1]:
+            continue
+
+        stop = min(j + n_fit_points, m.shape[1])
+        n = stop - j
+        sx = 0.0
+        sy = 0.0
+        sxx = 0.0
+        sxy = 0.0
+        for k in range(j, stop):
+            x = h[i, k]
+            y = m[i, k]
+            sx += x
+            sy += y
+            sxx += x*x
+            sxy += x*y
+
+        slope = (sxy - sx*sy/n) / (sxx - sx*sx/n)
+        intercept = (sy - slope*sx) / n
+        for k in range(j):
+            m[i, k] = slope*h[i, k] + intercept
+
+
+_sg_convolvers = {}
+
+
+def sg_convolver(sf):
+    """Return a convolver running both separable Savitzky-Golay passes, specialized on sf.
+
+    The half-width is captured in the closure, so numba sees the window bounds as
+    compile-time constants and can fully unroll the tap loops with the kernel weights held
+    in registers. Compiled variants are kept in a module-level cache keyed on sf.
+
+    Parameters
+    ----------
+    sf : int
+        Smoothing factor (kernel half-width).
+
+    Returns
+    -------
+    callable
+        conv(input, kernel_x, kernel_y, scale) applying the horizontal then the vertical 1-D
+        kernel, scaling at the output write, with nan borders of width sf like
+        fast_symmetric_convolve.
+    """
+
+    if sf not in _sg_convolvers:
+
+        @nb.jit(nopython=True, nogil=True, parallel=True, fastmath={'reassoc', 'contract'})
+        def conv(input, kernel_x, kernel_y, scale):
+            # The vertical pass only reads the interior columns of the row buffer, and the
+            # interior of the result is overwritten, so neither needs a full nan fill: the
+            # buffer is left uninitialized and only the result borders are filled.
+            rows = np.empty(input.shape)
+            for i in nb.prange(input.shape[0]):
+                for j in range(sf, input.shape[1]-sf):
+                    acc = 0.0
+                    for n in range(-sf, sf+1):
+                        acc += input[i, j+n]*kernel_x[n+sf]
+                    rows[i, j] = acc
+
+            result = np.empty(input.shape)
+            result[:sf, :] = np.nan
+            result[input.shape[0]-sf:, :] = np.nan
+            result[:, :sf] = np.nan
+            result[:, input.shape[1]-sf:] = np.nan
+            for i in nb.prange(sf, input.shape[0]-sf):
+                for j in range(sf, input.shape[1]-sf):
+                    acc = 0.0
+                    for n in range(-sf, sf+1):
+                        acc += rows[i+n, j]*kernel_y[n+sf]
+                    result[i, j] = scale*acc
+
+            return result
+
+        _sg_convolvers[sf] = conv
+
+    return _sg_convolvers[sf]
+
+
+@nb.jit(nopython=True, nogil=True, cache=True)
 def arg_first_not_nan(arr):
-    i = np.argwhere(np.logical_not(np.isnan(arr)))
-    if i.shape[0] == 0:
-        raise ValueError("Array is only filled with nan values")
-    else:
-        return i[0][0]
+    # Early-exit scan: stops at the first valid sample instead of building argwhere arrays
+    # over the whole row.
+    for i in range(arr.shape[0]):
+        if not np.isnan(arr[i]):
+            return i
+    raise ValueError("Array is only filled with nan values")
 
 
-# @nb.jit(nb.int64(nb.float64[:]), nopython=True, nogil=True)
-# @nb.jit(nopython=True, nogil=True)
+@nb.jit(nopython=True, nogil=True, cache=True)
 def arg_last_non_nan(arr):
-    return arr.shape[0] - 1 - arg_first_not_nan(np.flip(arr, 0))
+    for i in range(arr.shape[0]-1, -1, -1):
+        if not np.isnan(arr[i]):
+            return i
+    raise ValueError("Array is only filled with nan values")
+
 
+# No eager signature: an explicit boolean[:] would pin the layout-agnostic strided
+# specialization; lazy compilation picks the contiguous one for contiguous masks.
+@nb.jit(nopython=True, nogil=True, cache=True)
+def nb_argwhere(mask):
+    # Count, allocate exactly, scatter. Takes a boolean mask directly — callers with a float
+    # array can pass arr != 0 — instead of the old float-typed intermediate, which also
+    # returned float indices and overwrote whole rows of a (1, n) buffer.
+    n = 0
+    for i in range(mask.shape[0]):
+        if mask[i]:
+            n += 1
 
-# nb_argwhere and nb_where are potentially faster than numpy's equivalent functions, but have not been validated.
-# Use with caution.
-@nb.jit(nopython=True, nogil=True)
-def nb_argwhere(arr):
-    is_nonzero = nb_where(arr)
-    ret = np.empty((1, np.sum(is_nonzero)))
+    ret = np.empty(n, dtype=np.int64)
     j = 0
-    for i in range(arr.shape[0]):
-        if is_nonzero[i]:
+    for i in range(mask.shape[0]):
+        if mask[i]:
             ret[j] = i
             j += 1
     return ret
 
 
-@nb.jit(nopython=True, nogil=True)
-def nb_where(arr):
-    ret = np.empty_like(arr)
-    for i in range(arr.shape[0]):
-        ret[i] = True if arr[i] != 0 else False
-    return ret
-
-
-@nb.jit(nopython=True, nogil=True)
 def hhr_to_hchb(h, hr):
+    # Two vectorized numpy expressions; a jit wrapper here only adds dispatch and compile
+    # cost. Works on scalars and arrays alike.
     return 0.5*(h-hr), 0.5*(h+hr)
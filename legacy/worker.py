@@ -1,21 +1,26 @@
 from PyQt5 import QtCore, QtWidgets, QtGui
 
+# Sentinel placed on the input queue to tell the worker to drain and exit cooperatively.
+STOP = object()
+
 
 class WorkerThread(QtCore.QThread):
 
     job_done = QtCore.pyqtSignal()
 
-    def __init__(self, input_queue, data_queue, parent=None):
+    def __init__(self, input_queue, parent=None):
         super().__init__(parent=parent)
         self.running = False
         self.input_queue = input_queue
-        self.data_queue = data_queue
         self._data = []
-        self.parent().send_latest_data.connect(self.queue_latest_data)
         return
 
     def compute(self):
-        function, args, kwargs = self.input_queue.get()
+        job = self.input_queue.get()
+        if job is STOP:
+            self.running = False
+            return
+        function, args, kwargs = job
         if args is None:
             self._data.append(function(self._data[-1], **kwargs))
         else:
@@ -27,12 +32,13 @@ class WorkerThread(QtCore.QThread):
         self.running = True
         while self.running:
             self.compute()
-        self.running = False
         return
 
-    def queue_latest_data(self):
-        self.data_queue.put(self._data[-1])
-        return
+    def get_latest_data(self):
+        # Direct, synchronous hand-off of the latest result by reference. Appends and reads
+        # of the results list are atomic under the GIL, so no event-loop round-trip or queue
+        # is needed.
+        return self._data[-1]
 
     def get_n_data(self):
         return len(self._data)
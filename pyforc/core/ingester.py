@@ -126,10 +126,7 @@ def interpolate(
         np.linspace(hr_min, hr_max, int((hr_max - hr_min) // step) + 1),
     )
 
-    hhr_vals = np.concatenate(
-        (np.reshape(h_vals, (-1, 1)), np.reshape(hr_vals, (-1, 1))),
-        axis=1
-    ),
+    hhr_vals = np.column_stack((h_vals, hr_vals))
 
     m = si.griddata(hhr_vals, m_vals, (h, hr), method=interpolation)
 
@@ -0,0 +1,39 @@
+"""Regression tests for the legacy FORC pipeline."""
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+LEGACY_DIR = pathlib.Path(__file__).parent.parent / 'legacy'
+sys.path.insert(0, str(LEGACY_DIR))
+
+import Forc  # noqa: E402
+
+TEST_FORC = str(LEGACY_DIR / 'test_data' / 'test_forc')
+
+
+@pytest.mark.parametrize('extension', ['flat', 'slope', 'truncate'])
+def test_compute_forc_distribution_default_dtype(extension):
+    """Dataset extension must line up with the grid under the default (float32) dtype."""
+    forc = Forc.PMCForc(path=TEST_FORC, method='cubic')
+    result = forc.compute_forc_distribution(sf=3, extension=extension)
+
+    assert result.rho.shape == result.m.shape
+    assert np.isfinite(result.rho).any()
+
+
+def test_float32_default_matches_float64():
+    """The float32 default must track the float64 opt-in through the full distribution."""
+    f32 = Forc.PMCForc(path=TEST_FORC, method='cubic')
+    f64 = Forc.PMCForc(path=TEST_FORC, method='cubic', dtype=np.float64)
+
+    assert f32.m.dtype == np.float32
+    assert f64.m.dtype == np.float64
+
+    rho32 = f32.compute_forc_distribution(sf=3).rho
+    rho64 = f64.compute_forc_distribution(sf=3).rho
+
+    assert (np.isnan(rho32) == np.isnan(rho64)).all()
+    both = np.isfinite(rho64)
+    assert np.max(np.abs(rho32[both] - rho64[both])) < 1e-3*np.max(np.abs(rho64[both]))